@@ -11,7 +11,7 @@
 - created_at -> datetime (the time the search occurred)
 """
 
-from sqlalchemy import Table, MetaData, String, Column, DateTime, ForeignKey
+from sqlalchemy import Table, MetaData, String, Column, DateTime, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -39,6 +39,15 @@ search_results_table = Table(
     Column("created_at", DateTime, nullable=False),
 )
 
+# serves the cache lookup by search_term within the last hour
+Index(
+    "search_results_search_term_created_at_idx",
+    search_results_table.c.search_term,
+    search_results_table.c.created_at.desc(),
+)
+# serves analytics per user, e.g the user who queries us the most
+Index("search_results_user_id_idx", search_results_table.c.user_id)
+
 extracted_search_results_table = Table(
     "extracted_search_results",
     main_metadata,
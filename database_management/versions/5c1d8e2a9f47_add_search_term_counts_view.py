@@ -0,0 +1,45 @@
+"""Add search_term_counts materialized view
+
+Revision ID: 5c1d8e2a9f47
+Revises: b7f9f0298ec7
+Create Date: 2024-05-22 20:41:07.552918
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d8e2a9f47"
+down_revision: Union[str, None] = "b7f9f0298ec7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE MATERIALIZED VIEW search_term_counts AS "
+        "SELECT search_term, "
+        "count(*) AS search_count, "
+        "max(created_at) AS last_searched_at "
+        "FROM search_results "
+        "GROUP BY search_term"
+    )
+    # REFRESH MATERIALIZED VIEW CONCURRENTLY needs a unique index on the view
+    op.create_index(
+        "search_term_counts_search_term_idx",
+        "search_term_counts",
+        ["search_term"],
+        unique=True,
+    )
+    op.create_index(
+        "search_term_counts_search_count_idx",
+        "search_term_counts",
+        ["search_count"],
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW search_term_counts")
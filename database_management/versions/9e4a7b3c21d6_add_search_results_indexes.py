@@ -0,0 +1,51 @@
+"""Add search_results indexes
+
+Revision ID: 9e4a7b3c21d6
+Revises: 5c1d8e2a9f47
+Create Date: 2024-05-25 16:08:52.174630
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4a7b3c21d6"
+down_revision: Union[str, None] = "5c1d8e2a9f47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY doesn't lock out inserts while it builds,
+    # but can't run inside alembic's migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "search_results_search_term_created_at_idx",
+            "search_results",
+            ["search_term", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "search_results_user_id_idx",
+            "search_results",
+            ["user_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "search_results_user_id_idx",
+            table_name="search_results",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "search_results_search_term_created_at_idx",
+            table_name="search_results",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,46 @@
+"""Notify search_results_changed on search_results inserts
+
+Revision ID: b7f9f0298ec7
+Revises: 3a59c01381f4
+Create Date: 2024-05-20 21:12:40.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7f9f0298ec7"
+down_revision: Union[str, None] = "3a59c01381f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NOTIFY payloads must be under 8000 bytes; for longer search terms
+    # send an empty payload, which listeners treat as "invalidate everything"
+    op.execute(
+        "CREATE OR REPLACE FUNCTION notify_search_results_changed() "
+        "RETURNS trigger AS $$ "
+        "BEGIN "
+        "    IF octet_length(NEW.search_term) < 8000 THEN "
+        "        PERFORM pg_notify('search_results_changed', NEW.search_term); "
+        "    ELSE "
+        "        PERFORM pg_notify('search_results_changed', ''); "
+        "    END IF; "
+        "    RETURN NULL; "
+        "END; "
+        "$$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        "CREATE TRIGGER search_results_changed "
+        "AFTER INSERT ON search_results "
+        "FOR EACH ROW EXECUTE FUNCTION notify_search_results_changed()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER search_results_changed ON search_results")
+    op.execute("DROP FUNCTION notify_search_results_changed()")
@@ -1,12 +1,18 @@
+import asyncio
 from datetime import datetime
+from unittest.mock import patch
+
 import pytest
+from sqlalchemy import TextClause, text
 
 from integration_tests.conftest import integration_test_db_config
 from integration_tests.src.utils.clear_tables import ClearTables
 from integration_tests.src.utils.engine import dummy_uuid
 from integration_tests.src.utils.fetch import Fetch
+from integration_tests.src.utils.insert import Insert
 
 from src.models.search_results import SearchResults
+from src.models.search_term_count import SearchTermCount
 from src.models.user import User
 from src.services.yahoo_search_dao import YahooSearchDAO
 
@@ -83,3 +89,299 @@ class TestYahooSearchDAO:
         assert results_row == search_results
         await ClearTables.clear_search_table()
         await ClearTables.clear_user_table()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_insert_searches(self) -> None:
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+        user: User = User(
+            user_id=str(dummy_uuid),
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        await yahoo_search_dao.insert_user(user)
+
+        search_results: list[SearchResults] = [
+            SearchResults(
+                search_id=f"dummy_search_id_{i}",
+                user_id=str(dummy_uuid),
+                search_term="coffee bean tea leaf",
+                result=f"dummy results {i}",
+                created_at=datetime(year=2024, month=4, day=10, hour=12),
+            )
+            for i in range(3)
+        ]
+        await yahoo_search_dao.insert_searches(search_results)
+
+        results_row: list[SearchResults] = await Fetch.fetch_all_searches()
+        assert sorted(results_row, key=lambda row: row.search_id) == search_results
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_iter_all_searches(self) -> None:
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+        user: User = User(
+            user_id=str(dummy_uuid),
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        await yahoo_search_dao.insert_user(user)
+
+        search_results: list[SearchResults] = [
+            SearchResults(
+                search_id=f"dummy_search_id_{i}",
+                user_id=str(dummy_uuid),
+                search_term="coffee bean tea leaf",
+                result=f"dummy results {i}",
+                created_at=datetime(year=2024, month=4, day=10, hour=12),
+            )
+            for i in range(3)
+        ]
+        await yahoo_search_dao.insert_searches(search_results)
+
+        results_row: list[SearchResults] = [
+            search_result
+            async for search_result in yahoo_search_dao.iter_all_searches()
+        ]
+        assert sorted(results_row, key=lambda row: row.search_id) == search_results
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_fetch_by_term(self) -> None:
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+        # the cache outlives the truncated tables; start each test with it empty
+        yahoo_search_dao._cache.clear()
+        user: User = User(
+            user_id=str(dummy_uuid),
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        await yahoo_search_dao.insert_user(user)
+
+        stale_result: SearchResults = SearchResults(
+            search_id="dummy_stale_search_id",
+            user_id=str(dummy_uuid),
+            search_term="coffee bean tea leaf",
+            result="dummy results",
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        fresh_result: SearchResults = SearchResults.create(
+            str(dummy_uuid), "coffee bean tea leaf", "dummy results"
+        )
+        await yahoo_search_dao.insert_searches([stale_result, fresh_result])
+        assert await yahoo_search_dao.fetch_by_term("coffee bean tea leaf") == [
+            fresh_result
+        ]
+
+        another_result: SearchResults = SearchResults.create(
+            str(dummy_uuid), "coffee bean tea leaf", "more dummy results"
+        )
+        await yahoo_search_dao.insert_search(another_result)
+        results_row: list[SearchResults] = await yahoo_search_dao.fetch_by_term(
+            "coffee bean tea leaf"
+        )
+        assert sorted(results_row, key=lambda row: row.created_at) == [
+            fresh_result,
+            another_result,
+        ]
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_fetch_by_term_invalidated_by_other_writers(self) -> None:
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+        yahoo_search_dao._cache.clear()
+        user: User = User(
+            user_id=str(dummy_uuid),
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        await yahoo_search_dao.insert_user(user)
+        # the first lookup starts the listener; cache the term once it is listening
+        await yahoo_search_dao.fetch_by_term("coffee bean tea leaf")
+        await asyncio.wait_for(yahoo_search_dao._listening.wait(), timeout=5)
+        assert await yahoo_search_dao.fetch_by_term("coffee bean tea leaf") == []
+        assert "coffee bean tea leaf" in yahoo_search_dao._cache
+
+        # insert through a different engine, as another server process would
+        await Insert.insert_search(
+            SearchResults.create(str(dummy_uuid), "coffee bean tea leaf", "dummy")
+        )
+        for _ in range(100):
+            if "coffee bean tea leaf" not in yahoo_search_dao._cache:
+                break
+            await asyncio.sleep(0.01)
+        assert "coffee bean tea leaf" not in yahoo_search_dao._cache
+        assert len(await yahoo_search_dao.fetch_by_term("coffee bean tea leaf")) == 1
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_top_search_terms(self) -> None:
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+        user: User = User(
+            user_id=str(dummy_uuid),
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        await yahoo_search_dao.insert_user(user)
+
+        search_results: list[SearchResults] = [
+            SearchResults(
+                search_id=f"dummy_search_id_{i}",
+                user_id=str(dummy_uuid),
+                search_term=search_term,
+                result="dummy results",
+                created_at=datetime(year=2024, month=4, day=10, hour=12, minute=i),
+            )
+            for i, search_term in enumerate(
+                ["coffee bean tea leaf", "swedish berry", "coffee bean tea leaf"]
+            )
+        ]
+        await yahoo_search_dao.insert_searches(search_results)
+        await yahoo_search_dao.refresh_search_term_counts()
+
+        assert await yahoo_search_dao.top_search_terms(limit=1) == [
+            SearchTermCount(
+                search_term="coffee bean tea leaf",
+                search_count=2,
+                last_searched_at=datetime(
+                    year=2024, month=4, day=10, hour=12, minute=2
+                ),
+            )
+        ]
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+        await yahoo_search_dao.refresh_search_term_counts()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_copy_insert_searches(self) -> None:
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+        user: User = User(
+            user_id=str(dummy_uuid),
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        await yahoo_search_dao.insert_user(user)
+
+        search_results: list[SearchResults] = [
+            SearchResults(
+                search_id=f"dummy_search_id_{i}",
+                user_id=str(dummy_uuid),
+                search_term="coffee bean tea leaf",
+                result=f"dummy results {i}" if i % 2 else None,
+                created_at=datetime(year=2024, month=4, day=10, hour=12),
+            )
+            for i in range(3)
+        ]
+        await yahoo_search_dao.copy_insert_searches(search_results)
+
+        results_row: list[SearchResults] = await Fetch.fetch_all_searches()
+        assert sorted(results_row, key=lambda row: row.search_id) == search_results
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_insert_user_and_search(self) -> None:
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+        user: User = User(
+            user_id=str(dummy_uuid),
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        search_results: list[SearchResults] = [
+            SearchResults(
+                search_id=f"dummy_search_id_{i}",
+                user_id=str(dummy_uuid),
+                search_term="coffee bean tea leaf",
+                result="dummy results",
+                created_at=datetime(year=2024, month=4, day=10, hour=12),
+            )
+            for i in range(2)
+        ]
+        # the second call finds the user already exists, and only adds the search
+        for search_result in search_results:
+            await yahoo_search_dao.insert_user_and_search(user, search_result)
+
+        assert await Fetch.fetch_all_users() == [user]
+        results_row: list[SearchResults] = await Fetch.fetch_all_searches()
+        assert sorted(results_row, key=lambda row: row.search_id) == search_results
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_inserts_are_idempotent(self) -> None:
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+        user: User = User(
+            user_id=str(dummy_uuid),
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        search_result: SearchResults = SearchResults(
+            search_id="dummy_search_id",
+            user_id=str(dummy_uuid),
+            search_term="coffee bean tea leaf",
+            result="dummy results",
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        for _ in range(2):
+            await yahoo_search_dao.insert_user(user)
+            await yahoo_search_dao.insert_search(search_result)
+            await yahoo_search_dao.insert_user_and_search(user, search_result)
+
+        assert await Fetch.fetch_all_users() == [user]
+        assert await Fetch.fetch_all_searches() == [search_result]
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_fetch_by_term_skips_caching_when_invalidated_mid_query(
+        self,
+    ) -> None:
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
+        yahoo_search_dao._cache.clear()
+        user: User = User(
+            user_id=str(dummy_uuid),
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        await yahoo_search_dao.insert_user(user)
+        await yahoo_search_dao.fetch_by_term("swedish berry")
+        await asyncio.wait_for(yahoo_search_dao._listening.wait(), timeout=5)
+
+        async def insert_during_select() -> None:
+            """
+            Commits a search after the slow SELECT below took its snapshot,
+            and waits until its notification has been handled
+            """
+            await asyncio.sleep(0.1)
+            invalidations_before: int = yahoo_search_dao._invalidations
+            await Insert.insert_search(
+                SearchResults.create(str(dummy_uuid), "coffee bean tea leaf", "dummy")
+            )
+            while yahoo_search_dao._invalidations == invalidations_before:
+                await asyncio.sleep(0.01)
+
+        # same query, but sleeps after taking its snapshot, so the insert,
+        # and its notification, land before the result is stored in the cache
+        slow_select_clause: TextClause = text(
+            "SELECT search_id, user_id, "
+            "search_term, result, created_at "
+            "FROM search_results "
+            "WHERE (SELECT true FROM pg_sleep(1)) "
+            "AND search_term = :search_term AND created_at >= :cutoff"
+        )
+        with patch.object(
+            yahoo_search_dao, "_SELECT_SEARCHES_BY_TERM_CLAUSE", slow_select_clause
+        ):
+            results_row, _ = await asyncio.gather(
+                yahoo_search_dao.fetch_by_term("coffee bean tea leaf"),
+                insert_during_select(),
+            )
+        assert results_row == []
+        # the stale result wasn't cached, so the next lookup sees the new search
+        assert "coffee bean tea leaf" not in yahoo_search_dao._cache
+        assert len(await yahoo_search_dao.fetch_by_term("coffee bean tea leaf")) == 1
+        await ClearTables.clear_search_table()
+        await ClearTables.clear_user_table()
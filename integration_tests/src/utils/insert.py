@@ -0,0 +1,22 @@
+from sqlalchemy import TextClause, text
+
+from src.models.search_results import SearchResults
+from integration_tests.src.utils.engine import engine
+
+
+class Insert:
+    @staticmethod
+    async def insert_search(result: SearchResults) -> None:
+        """
+        Inserts a search result without going through YahooSearchDAO
+        - Simulates a write from another server process
+        """
+        insert_clause: TextClause = text(
+            "INSERT into search_results("
+            "search_id, user_id, search_term, result, created_at"
+            ") values ("
+            ":search_id, :user_id, :search_term, :result, :created_at"
+            ")"
+        )
+        async with engine.begin() as connection:
+            await connection.execute(insert_clause, result.model_dump())
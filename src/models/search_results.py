@@ -1,7 +1,7 @@
 from datetime import datetime
 import uuid
 
-from pydantic import BaseModel, ConfigDict, SkipValidation
+from pydantic import BaseModel, ConfigDict, SkipValidation, field_serializer
 
 
 class SearchResults(BaseModel):
@@ -12,6 +12,10 @@ class SearchResults(BaseModel):
     created_at: SkipValidation[datetime]
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    @field_serializer("created_at", when_used="json")
+    def serialize_created_at(self, created_at: datetime) -> str:
+        return created_at.strftime("%Y-%m-%d %H:%M:%S")
+
     @staticmethod
     def create(user_id: str, search_term: str, result: str | None) -> "SearchResults":
         return SearchResults(
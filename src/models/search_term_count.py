@@ -0,0 +1,10 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, SkipValidation
+
+
+class SearchTermCount(BaseModel):
+    search_term: str
+    search_count: int
+    last_searched_at: SkipValidation[datetime]
+    model_config = ConfigDict(arbitrary_types_allowed=True)
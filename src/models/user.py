@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict, SkipValidation
+from pydantic import BaseModel, ConfigDict, SkipValidation, field_serializer
 
 
 class User(BaseModel):
@@ -8,6 +8,10 @@ class User(BaseModel):
     created_at: SkipValidation[datetime]
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    @field_serializer("created_at", when_used="json")
+    def serialize_created_at(self, created_at: datetime) -> str:
+        return created_at.strftime("%Y-%m-%d %H:%M:%S")
+
     @staticmethod
     def create_user() -> "User":
         return User(
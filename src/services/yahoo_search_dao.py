@@ -1,19 +1,48 @@
 import asyncio
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
 
 import toml
-from retry import retry
 from sqlalchemy import CursorResult, Row, TextClause, text
 from typing import Any
 
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncResult,
+    create_async_engine,
+)
 
 from src.models.search_results import SearchResults
+from src.models.search_term_count import SearchTermCount
 from src.models.user import User
+from src.utils.async_retry import async_retry
 from src.utils.construct_connection_string import (
     construct_sqlalchemy_url_from_db_config,
 )
+from src.utils.ttl_cache import TTLCache
+
+
+@lru_cache(maxsize=1)
+def _load_config(path: str = "local_config/config.toml") -> dict[str, Any]:
+    """
+    Parses the config file once, the first time a DAO is built without a db_config
+    """
+    return toml.load(path)
+
+
+# reads (and the idempotent view refresh) are safe to repeat, so retry them
+# on transient database errors, backing off exponentially from 10ms, with jitter
+_retry_reads = async_retry(
+    exceptions=SQLAlchemyError,
+    tries=5,
+    delay=0.01,
+    jitter=(-0.01, 0.01),
+    backoff=2,
+)
 
 
 class YahooSearchDAO:
@@ -69,159 +98,635 @@ class YahooSearchDAO:
     2. Cache the query into search_results table
     """
 
-    def __init__(
-        self,
-        db_config: dict[str, Any] = toml.load("local_config/config.toml")["database"],
-    ):
-        self.__db_config: dict[str, Any] = db_config
-        self._engine: AsyncEngine = create_async_engine(
-            construct_sqlalchemy_url_from_db_config(self.__db_config, use_async_pg=True)
-        )
+    # one engine (and therefore one connection pool) per database url, shared by
+    # every YahooSearchDAO in the process, so constructing a DAO never opens a
+    # second pool against the same database
+    _engines: dict[str, AsyncEngine] = {}
+    # number of open (not yet aclose'd) DAOs using each engine
+    _engine_refs: dict[str, int] = {}
+
+    # how long _insert_worker waits for more submissions before flushing a batch,
+    # and the most rows it flushes in one INSERT
+    _INSERT_BATCH_WINDOW_SECONDS: float = 0.005
+    _INSERT_BATCH_MAX_SIZE: int = 128
+
+    # rows iter_all_searches pulls from its server-side cursor per round-trip
+    _FETCH_BATCH_SIZE: int = 1000
+
+    # search results within this window are returned by fetch_by_term (Use Case 1)
+    _CACHE_WINDOW: timedelta = timedelta(hours=1)
+    _CACHE_MAX_TERMS: int = 10_000
+    # cached terms are invalidated as soon as a new row is inserted for them
+    # (see _listen_invalidations); the ttl is only a backstop for missed notifications
+    _CACHE_TTL: timedelta = timedelta(hours=24)
+    # notified by the search_results_changed trigger, with the inserted search_term
+    _INVALIDATION_CHANNEL: str = "search_results_changed"
+    # how often _listen_invalidations checks its connection still answers,
+    # and how long it waits for the answer
+    _LISTENER_PING_INTERVAL_SECONDS: float = 30
+    _LISTENER_PING_TIMEOUT_SECONDS: float = 5
 
-    @retry(
-        exceptions=SQLAlchemyError,
-        tries=5,
-        delay=0.01,
-        jitter=(-0.01, 0.01),
-        backoff=2,
+    # statements are built once here rather than on every call
+    # inserts are idempotent: re-inserting an existing id is a no-op, so a caller
+    # retrying after e.g a dropped connection can't create duplicate rows
+    _INSERT_SEARCH_CLAUSE: TextClause = text(
+        "INSERT into search_results("
+        "   search_id, "
+        "   user_id, "
+        "   search_term, "
+        "   result, "
+        "   created_at"
+        ") values ("
+        "   :search_id,"
+        "   :user_id,"
+        "   :search_term,"
+        "   :result,"
+        "   :created_at"
+        ") "
+        "ON CONFLICT (search_id) DO NOTHING"
+    )
+    _INSERT_USER_CLAUSE: TextClause = text(
+        "INSERT into users("
+        "   user_id, "
+        "   created_at"
+        ") values ("
+        "   :user_id,"
+        "   :created_at"
+        ") "
+        "ON CONFLICT (user_id) DO NOTHING"
+    )
+    # inserts the user and the search, skipping either if it already exists
+    _INSERT_USER_AND_SEARCH_CLAUSE: TextClause = text(
+        "WITH new_user AS ("
+        "   INSERT into users(user_id, created_at) "
+        "   values (:user_id, :user_created_at) "
+        "   ON CONFLICT (user_id) DO NOTHING"
+        ") "
+        "INSERT into search_results("
+        "   search_id, "
+        "   user_id, "
+        "   search_term, "
+        "   result, "
+        "   created_at"
+        ") values ("
+        "   :search_id,"
+        "   :user_id,"
+        "   :search_term,"
+        "   :result,"
+        "   :created_at"
+        ") "
+        "ON CONFLICT (search_id) DO NOTHING"
+    )
+    # the SELECTs below read rows whose types the table / view schema already
+    # guarantees, so their results are built with model_construct,
+    # skipping pydantic's validation
+    _SELECT_SEARCHES_CLAUSE: TextClause = text(
+        "SELECT search_id, user_id, "
+        "search_term, result, created_at "
+        "FROM search_results"
+    ).execution_options(yield_per=_FETCH_BATCH_SIZE)
+    _SELECT_SEARCHES_BY_TERM_CLAUSE: TextClause = text(
+        "SELECT search_id, user_id, "
+        "search_term, result, created_at "
+        "FROM search_results "
+        "WHERE search_term = :search_term AND created_at >= :cutoff"
+    )
+    _SELECT_USERS_CLAUSE: TextClause = text("SELECT user_id, created_at FROM users")
+    _SELECT_TOP_SEARCH_TERMS_CLAUSE: TextClause = text(
+        "SELECT search_term, search_count, last_searched_at "
+        "FROM search_term_counts "
+        "ORDER BY search_count DESC "
+        "LIMIT :limit"
     )
+    _REFRESH_SEARCH_TERM_COUNTS_CLAUSE: TextClause = text(
+        "REFRESH MATERIALIZED VIEW CONCURRENTLY search_term_counts"
+    )
+
+    def __init__(self, db_config: dict[str, Any] | None = None):
+        self.__db_config: dict[str, Any] = (
+            db_config if db_config is not None else _load_config()["database"]
+        )
+        self.__url: str = construct_sqlalchemy_url_from_db_config(
+            self.__db_config, use_async_pg=True
+        )
+        self._engine: AsyncEngine = YahooSearchDAO._get_engine(self.__url)
+        YahooSearchDAO._engine_refs[self.__url] = (
+            YahooSearchDAO._engine_refs.get(self.__url, 0) + 1
+        )
+        # __closing is set as soon as aclose starts, __closed once the pending
+        # inserts are flushed; from then on every public method raises
+        self.__closing: bool = False
+        self.__closed: bool = False
+        # insert_search submissions waiting to be flushed by _insert_worker
+        self._insert_q: asyncio.Queue[tuple[SearchResults, asyncio.Future[None]]] = (
+            asyncio.Queue()
+        )
+        self._insert_worker_task: asyncio.Task[None] | None = None
+        # search_term -> search results created within _CACHE_WINDOW of the lookup
+        self._cache: TTLCache[str, list[SearchResults]] = TTLCache(
+            maxsize=self._CACHE_MAX_TERMS, ttl=self._CACHE_TTL.total_seconds()
+        )
+        self._listener_task: asyncio.Task[None] | None = None
+        # set while _listen_invalidations is subscribed to _INVALIDATION_CHANNEL
+        self._listening: asyncio.Event = asyncio.Event()
+        # bumped whenever cached terms may have gone stale (a notification, or the
+        # listener (re)starting); see fetch_by_term
+        self._invalidations: int = 0
+
+    @staticmethod
+    def _get_engine(url: str) -> AsyncEngine:
+        """
+        Lazily creates the shared engine for a database url
+
+        Pool settings
+        - pool_size / max_overflow: up to 30 concurrent connections before callers
+        queue for a free one (SQLAlchemy's default is only 5)
+        - pool_pre_ping: checks a connection is alive before handing it out,
+        so a restarted database doesn't surface as errors on the first queries
+        - pool_recycle: replaces connections older than 30 minutes
+        - statement caches: lets asyncpg reuse prepared statements on a connection,
+        so the class-level statements are only prepared once per connection
+        """
+        if url not in YahooSearchDAO._engines:
+            YahooSearchDAO._engines[url] = create_async_engine(
+                url,
+                pool_size=20,
+                max_overflow=10,
+                pool_pre_ping=True,
+                pool_recycle=1800,
+                connect_args={
+                    "statement_cache_size": 2048,
+                    "prepared_statement_cache_size": 2048,
+                },
+            )
+        return YahooSearchDAO._engines[url]
+
+    def _raise_if_closed(self) -> None:
+        if self.__closed:
+            raise RuntimeError("YahooSearchDAO is closed")
+
     async def insert_search(self, result: SearchResults) -> None:
+        """
+        Persists a single search result
+
+        Rather than paying a BEGIN/COMMIT round-trip per search, the result is
+        handed to _insert_worker, which coalesces concurrent submissions into one
+        insert_searches call. Returns once this result has been committed,
+        and raises the database's error if this result's row was rejected
+        """
+        await self._enqueue(result)
+
+    async def _enqueue(self, result: SearchResults) -> None:
+        self._raise_if_closed()
+        # the worker is spawned lazily, as it needs a running event loop.
+        # If the loop it ran on has since been torn down (e.g a previous
+        # asyncio.run), start a new worker and queue on the current loop
+        if self._insert_worker_task is None or self._insert_worker_task.done():
+            self._insert_q = asyncio.Queue()
+            self._insert_worker_task = asyncio.create_task(self._insert_worker())
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        await self._insert_q.put((result, future))
+        await future
+
+    async def _insert_worker(self) -> None:
+        """
+        Runs forever, flushing queued insert_search submissions
+
+        1. Block until at least one submission arrives
+        2. Keep collecting submissions until the batch window passes
+        or the batch is full
+        3. Insert the whole batch with one insert_searches call
+        4. Resolve every submitter's future with the outcome of its row
+
+        Stopped by aclose, which cancels it
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        batch: list[tuple[SearchResults, asyncio.Future[None]]] = []
+        try:
+            while True:
+                batch = [await self._insert_q.get()]
+                deadline: float = loop.time() + self._INSERT_BATCH_WINDOW_SECONDS
+                while len(batch) < self._INSERT_BATCH_MAX_SIZE:
+                    if not self._insert_q.empty():
+                        batch.append(self._insert_q.get_nowait())
+                        continue
+                    timeout: float = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(
+                                self._insert_q.get(), timeout=timeout
+                            )
+                        )
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._flush_batch(batch)
+                for _ in batch:
+                    self._insert_q.task_done()
+        except asyncio.CancelledError:
+            # don't leave anyone awaiting a submission that will never be flushed
+            while not self._insert_q.empty():
+                batch.append(self._insert_q.get_nowait())
+            for _, future in batch:
+                future.cancel()
+            raise
+
+    async def _flush_batch(
+        self, batch: list[tuple[SearchResults, asyncio.Future[None]]]
+    ) -> None:
+        """
+        Inserts a batch of submissions, resolving each submitter's future
+
+        If the database rejects the batch, e.g one row's user_id doesn't exist,
+        the whole transaction is rolled back. So the rows are retried one by one,
+        and only the submitter of a rejected row receives its error
+        """
+        try:
+            await self.insert_searches([result for result, _ in batch])
+        except DBAPIError as e:
+            if len(batch) > 1:
+                for submission in batch:
+                    await self._flush_batch([submission])
+                return
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    async def insert_searches(self, results: list[SearchResults]) -> None:
+        """
+        Persists many search results in one transaction
+
+        Passing a list of params to execute makes SQLAlchemy hand the rows to
+        asyncpg's executemany, so all rows share one BEGIN/COMMIT
+        instead of paying a round-trip each
+
+        Inserts aren't retried here: a retry after a commit whose reply was lost
+        would repeat the write. Stale pooled connections are instead caught
+        with pool_pre_ping, and since inserts are idempotent,
+        callers can safely retry themselves
+        """
+        self._raise_if_closed()
+        if not results:
+            return
+        async with self._engine.begin() as connection:
+            # use named-params here to prevent SQL-injection attacks
+            await connection.execute(
+                self._INSERT_SEARCH_CLAUSE,
+                [result.model_dump() for result in results],
+            )
+        self._add_to_cache(results)
+
+    async def copy_insert_searches(self, results: list[SearchResults]) -> None:
+        """
+        Bulk loads search results with PostgreSQL's COPY
+
+        For large loads, e.g backfilling or warming the cache
+        - COPY streams all rows to the database in one binary payload
+        - Much faster than INSERTs once there are thousands of rows,
+        as the database doesn't parse a statement per row
+        - For a handful of rows, use insert_search / insert_searches instead
+        """
+        self._raise_if_closed()
+        if not results:
+            return
+        async with self._engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            asyncpg_connection: Any = raw_connection.driver_connection
+            await asyncpg_connection.copy_records_to_table(
+                "search_results",
+                records=[
+                    (
+                        result.search_id,
+                        result.user_id,
+                        result.search_term,
+                        result.result,
+                        result.created_at,
+                    )
+                    for result in results
+                ],
+                columns=["search_id", "user_id", "search_term", "result", "created_at"],
+            )
+        self._add_to_cache(results)
+
+    def _add_to_cache(self, results: list[SearchResults]) -> None:
+        # keep terms that are already cached up-to-date; uncached terms are
+        # loaded in full by the next fetch_by_term
+        for result in results:
+            cached: list[SearchResults] | None = self._cache.get(result.search_term)
+            # a re-inserted search_id was skipped by ON CONFLICT, and may be cached
+            if cached is not None and all(
+                cached_result.search_id != result.search_id for cached_result in cached
+            ):
+                cached.append(result)
+
+    async def insert_user(self, user: User) -> None:
         """
         TODO: Integration test this
-        - Retry unit test -> does it catch the SQLAlchemyError
         """
+        self._raise_if_closed()
         async with self._engine.begin() as connection:
-            insert_clause: TextClause = text(
-                "INSERT into search_results("
-                "   search_id, "
-                "   user_id, "
-                "   search_term, "
-                "   result, "
-                "   created_at"
-                ") values ("
-                "   :search_id,"
-                "   :user_id,"
-                "   :search_term,"
-                "   :result,"
-                "   :created_at"
-                ")"
+            # use named-params here to prevent SQL-injection attacks
+            await connection.execute(
+                self._INSERT_USER_CLAUSE,
+                {"user_id": user.user_id, "created_at": user.created_at},
             )
+
+    async def insert_user_and_search(self, user: User, result: SearchResults) -> None:
+        """
+        Persists a user together with a search they made, in a single statement
+
+        For when a user is recorded at the same time as their first search
+        - One round-trip and one commit, instead of one each for
+        insert_user and insert_search
+        - The user, or the search, is left as-is if it already exists
+        """
+        self._raise_if_closed()
+        async with self._engine.begin() as connection:
             # use named-params here to prevent SQL-injection attacks
             await connection.execute(
-                insert_clause,
+                self._INSERT_USER_AND_SEARCH_CLAUSE,
                 {
+                    "user_id": user.user_id,
+                    "user_created_at": user.created_at,
                     "search_id": result.search_id,
-                    "user_id": result.user_id,
                     "search_term": result.search_term,
                     "result": result.result,
                     "created_at": result.created_at,
                 },
             )
+        self._add_to_cache([result])
 
-    @retry(
-        exceptions=SQLAlchemyError,
-        tries=5,
-        delay=0.01,
-        jitter=(-0.01, 0.01),
-        backoff=2,
-    )
-    async def insert_user(self, user: User) -> None:
+    @asynccontextmanager
+    async def _autocommit_connection(self) -> AsyncIterator[AsyncConnection]:
         """
-        TODO: Integration test this
+        Checks out a connection in AUTOCOMMIT mode, for a single read-only SELECT
+
+        - It doesn't need a transaction; AUTOCOMMIT skips the BEGIN / ROLLBACK
+        round-trips SQLAlchemy would otherwise wrap it in
         """
-        async with self._engine.begin() as connection:
-            insert_clause: TextClause = text(
-                "INSERT into users("
-                "   user_id, "
-                "   created_at"
-                ") values ("
-                "   :user_id,"
-                "   :created_at"
-                ")"
-            )
-            # use named-params here to prevent SQL-injection attacks
-            await connection.execute(
-                insert_clause, {"user_id": user.user_id, "created_at": user.created_at}
-            )
+        async with self._engine.connect() as connection:
+            yield await connection.execution_options(isolation_level="AUTOCOMMIT")
 
-    @retry(
-        exceptions=SQLAlchemyError,
-        tries=5,
-        delay=0.01,
-        jitter=(-0.01, 0.01),
-        backoff=2,
-    )
+    @_retry_reads
     async def fetch_all_searches(self) -> list[SearchResults]:
         """
         Integration test this
         """
-        async with self._engine.begin() as connection:
-            text_clause: TextClause = text(
-                "SELECT search_id, user_id, "
-                "search_term, result, created_at "
-                "FROM search_results"
+        return [search_result async for search_result in self.iter_all_searches()]
+
+    async def iter_all_searches(self) -> AsyncIterator[SearchResults]:
+        """
+        Streams every search result, instead of loading the whole table at once
+        - stream() reads through a server-side cursor,
+        _FETCH_BATCH_SIZE rows at a time
+        - So memory stays bounded by the batch, not by the table size
+        - Callers can e.g write each row into a chunked HTTP response as it arrives
+        """
+        self._raise_if_closed()
+        # server-side cursors need a transaction; connect() starts one on first
+        # execute, and rolls it back on exit, as there is nothing to commit
+        async with self._engine.connect() as connection:
+            result: AsyncResult = await connection.stream(self._SELECT_SEARCHES_CLAUSE)
+            async for partition in result.partitions():
+                for curr_row in partition:
+                    yield SearchResults.model_construct(**curr_row._mapping)
+
+    @_retry_reads
+    async def fetch_by_term(self, search_term: str) -> list[SearchResults]:
+        """
+        Fetches the search results for search_term created within the last hour
+
+        Implements the caching control flow in the class docstring
+        - Results are kept in an in-memory cache
+        - Repeated lookups of the same term don't hit the database
+        - A term is dropped from the cache whenever any process inserts a
+        search for it, so the cache doesn't need a short ttl to stay fresh
+        - It is still filtered by created_at on read, so results that fall out
+        of the window are never returned
+
+        A miss is only cached if nothing was invalidated while its SELECT ran
+        - Otherwise a search committed after the SELECT's snapshot, whose
+        notification arrived before we stored the result, would be missing
+        from the cache until the next insert for the term
+        - Likewise nothing is cached, or served from the cache, while the
+        listener isn't subscribed, as inserts from other processes would go
+        unnoticed
+
+        Cache misses are served by search_results_search_term_created_at_idx;
+        if this query changes, check with EXPLAIN that it still uses the index
+        """
+        self._raise_if_closed()
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_invalidations())
+        cutoff: datetime = datetime.utcnow() - self._CACHE_WINDOW
+        if self._listening.is_set():
+            cached: list[SearchResults] | None = self._cache.get(search_term)
+            if cached is not None:
+                return [result for result in cached if result.created_at >= cutoff]
+
+        invalidations_before: int = self._invalidations
+
+        async with self._autocommit_connection() as connection:
+            cursor: CursorResult = await connection.execute(
+                self._SELECT_SEARCHES_BY_TERM_CLAUSE,
+                {"search_term": search_term, "cutoff": cutoff},
             )
-            cursor: CursorResult = await connection.execute(text_clause)
             results: Sequence[Row] = cursor.fetchall()
             results_row: list[SearchResults] = [
-                SearchResults.parse_obj(
-                    {
-                        "search_id": curr_row[0],
-                        "user_id": curr_row[1],
-                        "search_term": curr_row[2],
-                        "result": curr_row[3],
-                        "created_at": curr_row[4],
-                    }
-                )
+                SearchResults.model_construct(**curr_row._mapping)
                 for curr_row in results
             ]
-        return results_row
+        if self._listening.is_set() and self._invalidations == invalidations_before:
+            self._cache[search_term] = results_row
+        return list(results_row)
 
-    @retry(
-        exceptions=SQLAlchemyError,
-        tries=5,
-        delay=0.01,
-        jitter=(-0.01, 0.01),
-        backoff=2,
-    )
+    @async_retry(exceptions=Exception, delay=1, max_delay=30, backoff=2)
+    async def _listen_invalidations(self) -> None:
+        """
+        Drops cached terms as search_results rows are inserted for them
+
+        1. Check out a connection, and LISTEN on _INVALIDATION_CHANNEL
+        2. The search_results_changed trigger notifies the channel with the
+        search_term of every inserted row, from any process
+        3. Each notification pops that term from the cache
+
+        Runs until aclose cancels it
+        - If the connection is lost, or stops answering the periodic ping
+        (a half-open socket never fires the termination listener),
+        the cache is cleared and async_retry logs the error and reconnects
+        - Failed connects are retried the same way, with backoff
+        """
+        async with self._engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            asyncpg_connection: Any = raw_connection.driver_connection
+            terminated: asyncio.Event = asyncio.Event()
+            asyncpg_connection.add_termination_listener(lambda _: terminated.set())
+            await asyncpg_connection.add_listener(
+                self._INVALIDATION_CHANNEL, self._on_search_results_changed
+            )
+            # anything inserted before we started listening may be missing
+            # from the cache, so start from a clean slate
+            self._cache.clear()
+            self._invalidations += 1
+            self._listening.set()
+            try:
+                while not terminated.is_set():
+                    try:
+                        await asyncio.wait_for(
+                            terminated.wait(),
+                            timeout=self._LISTENER_PING_INTERVAL_SECONDS,
+                        )
+                    except asyncio.TimeoutError:
+                        try:
+                            await asyncio.wait_for(
+                                asyncpg_connection.execute("SELECT 1"),
+                                timeout=self._LISTENER_PING_TIMEOUT_SECONDS,
+                            )
+                        except Exception:
+                            asyncpg_connection.terminate()
+                            raise
+                raise ConnectionError("invalidation listener connection was lost")
+            finally:
+                # nothing invalidates the cache until we are subscribed again
+                self._listening.clear()
+                self._cache.clear()
+                if asyncpg_connection.is_closed():
+                    # don't hand a dead connection back to the pool
+                    await connection.invalidate()
+                else:
+                    await asyncpg_connection.remove_listener(
+                        self._INVALIDATION_CHANNEL, self._on_search_results_changed
+                    )
+
+    def _on_search_results_changed(
+        self, connection: Any, pid: int, channel: str, payload: str
+    ) -> None:
+        self._invalidations += 1
+        # the trigger sends an empty payload when the term is too long to notify
+        if payload:
+            self._cache.pop(payload)
+        else:
+            self._cache.clear()
+
+    @_retry_reads
     async def fetch_all_users(self) -> list[User]:
         """
         Integration Test
         """
-        async with self._engine.begin() as connection:
-            text_clause: TextClause = text("SELECT user_id, created_at " "FROM users")
-            cursor: CursorResult = await connection.execute(text_clause)
+        self._raise_if_closed()
+        async with self._autocommit_connection() as connection:
+            cursor: CursorResult = await connection.execute(self._SELECT_USERS_CLAUSE)
             results: Sequence[Row] = cursor.fetchall()
             results_row: list[User] = [
-                User.parse_obj(
-                    {
-                        "user_id": curr_row[0],
-                        "created_at": curr_row[1],
-                    }
-                )
+                User.model_construct(**curr_row._mapping) for curr_row in results
+            ]
+        return results_row
+
+    @_retry_reads
+    async def top_search_terms(self, limit: int = 100) -> list[SearchTermCount]:
+        """
+        Fetches the most searched terms, most searched first (Use Case 2)
+
+        Reads from the search_term_counts materialized view,
+        which stores the count per search_term
+        - So the database doesn't scan and group all of search_results per call
+        - But counts are only as fresh as the last refresh_search_term_counts
+        """
+        self._raise_if_closed()
+        async with self._autocommit_connection() as connection:
+            cursor: CursorResult = await connection.execute(
+                self._SELECT_TOP_SEARCH_TERMS_CLAUSE, {"limit": limit}
+            )
+            results: Sequence[Row] = cursor.fetchall()
+            results_row: list[SearchTermCount] = [
+                SearchTermCount.model_construct(**curr_row._mapping)
                 for curr_row in results
             ]
         return results_row
 
+    @_retry_reads
+    async def refresh_search_term_counts(self) -> None:
+        """
+        Recomputes the search_term_counts materialized view
 
-if __name__ == "__main__":
+        Run this periodically, e.g from a cron job every few minutes
+        - CONCURRENTLY lets top_search_terms keep reading the old counts
+        while the new ones are computed
+        """
+        self._raise_if_closed()
+        async with self._engine.begin() as connection:
+            await connection.execute(self._REFRESH_SEARCH_TERM_COUNTS_CLAUSE)
+
+    async def aclose(self) -> None:
+        """
+        Shuts the DAO down cleanly; call this before the event loop closes
+
+        1. Waits for submitted insert_search calls to be flushed
+        2. Stops the insert worker and the cache invalidation listener
+        3. If this is the last open DAO using the shared pool, closes every
+        connection in it, so none are left open on the database at exit
+
+        Other open DAOs on the same database keep sharing the pool, and a DAO
+        created after the last one closed gets a new pool. Calling aclose
+        more than once is a no-op. Once it has flushed the pending inserts,
+        every other method raises RuntimeError
+        """
+        if self.__closing:
+            return
+        self.__closing = True
+        if self._insert_worker_task is not None and not self._insert_worker_task.done():
+            await self._insert_q.join()
+        self.__closed = True
+        for task in (self._insert_worker_task, self._listener_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        YahooSearchDAO._engine_refs[self.__url] -= 1
+        if YahooSearchDAO._engine_refs[self.__url] == 0:
+            del YahooSearchDAO._engine_refs[self.__url]
+            del YahooSearchDAO._engines[self.__url]
+            await self._engine.dispose()
+
+
+async def main() -> None:
     dao: YahooSearchDAO = YahooSearchDAO()
     sample_user: User = User.create_user()
     sample_search_results: SearchResults = SearchResults.create(
         sample_user.user_id, "how to work at macdonalds", "Dummy Search Results"
     )
+    try:
+        # search_results.user_id references users, so both are inserted in one
+        # statement, rather than committing the user first and then the search
+        await dao.insert_user_and_search(sample_user, sample_search_results)
+        """
+        The two fetches are independent, and each checks out its own pooled
+        connection, so gather runs both queries concurrently
+        """
+        search_results: list[SearchResults]
+        users: list[User]
+        search_results, users = await asyncio.gather(
+            dao.fetch_all_searches(), dao.fetch_all_users()
+        )
+        print(f"fetch_all_searches: {search_results}")
+        print(f"fetch_all_users: {users}")
+    finally:
+        # close the pool's connections while the event loop is still running
+        await dao.aclose()
 
-    event_loop = asyncio.new_event_loop()
+
+if __name__ == "__main__":
     """
-    each line here runs asynchronously
-    We know it does, as run_until_complete is not awaited, and no Future is returned
-    a Future object represents a computation that promises to be completed in the future
+    asyncio.run creates an event loop, runs main on it,
+    then cancels leftover tasks and closes the loop
     """
-    event_loop.run_until_complete(dao.insert_user(sample_user))
-    event_loop.run_until_complete(dao.insert_search(sample_search_results))
-    search_results: list[SearchResults] = event_loop.run_until_complete(
-        dao.fetch_all_searches()
-    )
-    print(f"fetch_all_searches: {search_results}")
-    users: list[User] = event_loop.run_until_complete(dao.fetch_all_users())
-    print(f"fetch_all_searches: {users}")
+    asyncio.run(main())
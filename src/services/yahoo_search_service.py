@@ -11,14 +11,19 @@ import asyncio
 
 
 class YahooSearchService:
-    def __init__(self, yahoo_search_dao: YahooSearchDAO = YahooSearchDAO()) -> None:
+    def __init__(self, yahoo_search_dao: YahooSearchDAO | None = None) -> None:
         """
         We do encapsulation here by making these attributes private
         so that it provides a clean interface
         for interacting with the class. It is not accessible outside the class
+
+        The DAO defaults to None rather than YahooSearchDAO(), so importing this
+        module doesn't open a DAO that is never closed, keeping the shared pool alive
         """
         self.__logger: logging.Logger = logging.Logger(__name__)
-        self.__yahoo_search_dao: YahooSearchDAO = yahoo_search_dao
+        self.__yahoo_search_dao: YahooSearchDAO = (
+            yahoo_search_dao if yahoo_search_dao is not None else YahooSearchDAO()
+        )
         setup_logging(self.__logger)
 
     @staticmethod
@@ -130,26 +135,33 @@ class YahooSearchService:
         return result
 
 
-if __name__ == "__main__":
+async def main() -> None:
     search_term: str = "menstrual cycle"
     dao: YahooSearchDAO = YahooSearchDAO()
-    dummy_user: User = User.create_user()
-    asyncio.run(dao.insert_user(dummy_user))
-    user: User = dummy_user  # dao.fetch_all_users()[0]
-    service: YahooSearchService = YahooSearchService()
+    try:
+        dummy_user: User = User.create_user()
+        await dao.insert_user(dummy_user)
+        user: User = dummy_user  # dao.fetch_all_users()[0]
+        service: YahooSearchService = YahooSearchService(yahoo_search_dao=dao)
+        response: SearchResults = await service.yahoo_search(user.user_id, search_term)
+        print(response)
+    finally:
+        await dao.aclose()
+
+
+if __name__ == "__main__":
     """
     Simplest way to run an async function
     - asyncio.run creates an event loop
     - runs the function
     - brings it down
-    
+
     Pro:
     - Easy to run, you dont have to explicitly create the event loop
-    
+
     Con
     - the event loop it creates is not re-usable, only available for itself
+    - so everything using it, e.g the DAO's pooled connections,
+    has to run within the one asyncio.run call
     """
-    response: SearchResults = asyncio.run(
-        service.yahoo_search(user.user_id, search_term)
-    )
-    print(response)
+    asyncio.run(main())
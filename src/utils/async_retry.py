@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable, Coroutine
+from functools import wraps
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+logging_logger: logging.Logger = logging.getLogger(__name__)
+
+
+def async_retry(
+    exceptions: type[Exception] | tuple[type[Exception], ...] = Exception,
+    tries: int = -1,
+    delay: float = 0,
+    max_delay: float | None = None,
+    backoff: float = 1,
+    jitter: float | tuple[float, float] = 0,
+    logger: logging.Logger | None = logging_logger,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Coroutine[Any, Any, R]]]:
+    """
+    The async version of retry.retry, taking the same arguments
+
+    We can't use retry.retry on async functions
+    - Calling an async function only creates a coroutine, it doesn't run it
+    - So retry.retry returns straight away, and never sees the exceptions
+    raised when the coroutine is awaited
+    - Even if it did, its time.sleep would block the event loop,
+    stalling every other request the server is handling
+
+    This awaits the function, and waits between tries with asyncio.sleep
+
+    :param exceptions: an exception or a tuple of exceptions to catch
+    :param tries: the maximum number of attempts; -1 means infinite
+    :param delay: initial delay between attempts, in seconds
+    :param max_delay: the maximum value of delay; None means no limit
+    :param backoff: multiplier applied to delay between attempts
+    :param jitter: extra seconds added to delay between attempts;
+    fixed if a number, random if a range tuple (min, max)
+    :param logger: logs a warning for every failed attempt; None disables it
+    """
+
+    def decorator(
+        fn: Callable[P, Awaitable[R]],
+    ) -> Callable[P, Coroutine[Any, Any, R]]:
+        @wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            remaining_tries: int = tries
+            current_delay: float = delay
+            while True:
+                try:
+                    return await fn(*args, **kwargs)
+                except exceptions as e:
+                    remaining_tries -= 1
+                    if remaining_tries == 0:
+                        raise
+                    if logger is not None:
+                        logger.warning(f"{e}, retrying in {current_delay} seconds...")
+                    await asyncio.sleep(current_delay)
+
+                    current_delay *= backoff
+                    if isinstance(jitter, tuple):
+                        current_delay += random.uniform(*jitter)
+                    else:
+                        current_delay += jitter
+                    if max_delay is not None:
+                        current_delay = min(current_delay, max_delay)
+
+        return wrapper
+
+    return decorator
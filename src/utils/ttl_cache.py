@@ -0,0 +1,50 @@
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    An in-memory dictionary, where every entry expires ttl seconds after it was set
+
+    - Holds at most maxsize entries; when full, the oldest entry is evicted
+    - Expired entries are dropped lazily, when they are next looked up
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.__maxsize: int = maxsize
+        self.__ttl: float = ttl
+        # key -> (expiry time, value), ordered from oldest to newest set
+        self.__entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self.__entries.pop(key, None)
+        while len(self.__entries) >= self.__maxsize:
+            self.__entries.popitem(last=False)
+        self.__entries[key] = (time.monotonic() + self.__ttl, value)
+
+    def get(self, key: K) -> V | None:
+        entry: tuple[float, V] | None = self.__entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self.__entries[key]
+            return None
+        return value
+
+    def pop(self, key: K) -> V | None:
+        entry: tuple[float, V] | None = self.__entries.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        self.__entries.clear()
@@ -1,3 +1,4 @@
+import json
 from uuid import UUID
 
 import pytest
@@ -53,3 +54,23 @@ class TestSearchResult:
                 user_id=user_id, search_term=search_term, result=result
             )
             assert search_results == expected_search_result
+
+    def test_model_dump_json(self) -> None:
+        search_results: SearchResults = SearchResults(
+            search_id=str(dummy_uuid),
+            user_id="dummy_user_id",
+            search_term="coffee bean tea leaf",
+            result="swedish berry",
+            created_at=datetime(year=2024, month=4, day=10, hour=12),
+        )
+        assert json.loads(search_results.model_dump_json()) == {
+            "search_id": str(dummy_uuid),
+            "user_id": "dummy_user_id",
+            "search_term": "coffee bean tea leaf",
+            "result": "swedish berry",
+            "created_at": "2024-04-10 12:00:00",
+        }
+        # python-mode dumps keep the datetime
+        assert search_results.model_dump()["created_at"] == datetime(
+            year=2024, month=4, day=10, hour=12
+        )
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from unittest.mock import patch
 from uuid import UUID
@@ -27,3 +28,13 @@ class TestUser:
         ):
             user: User = User.create_user()
             assert user == expected_output
+
+    def test_model_dump_json(self) -> None:
+        user: User = User(
+            user_id=str(dummy_uuid),
+            created_at=datetime(year=2024, month=4, day=9, hour=12),
+        )
+        assert json.loads(user.model_dump_json()) == {
+            "user_id": str(dummy_uuid),
+            "created_at": "2024-04-09 12:00:00",
+        }
@@ -0,0 +1,166 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.models.search_results import SearchResults
+from src.services.yahoo_search_dao import YahooSearchDAO
+
+
+class TestYahooSearchDAO:
+    @pytest.mark.asyncio_cooperative
+    async def test_insert_search_coalesces_concurrent_calls(self) -> None:
+        dao: YahooSearchDAO = YahooSearchDAO()
+        search_results: list[SearchResults] = [
+            SearchResults.create("dummy_user_id", f"search term {i}", "dummy result")
+            for i in range(5)
+        ]
+        with patch.object(dao, "insert_searches", new=AsyncMock()) as insert_searches:
+            await asyncio.gather(*[dao.insert_search(r) for r in search_results])
+        await dao.aclose()
+        insert_searches.assert_awaited_once_with(search_results)
+
+    @pytest.mark.asyncio_cooperative
+    async def test_insert_search_raises_batch_error(self) -> None:
+        dao: YahooSearchDAO = YahooSearchDAO()
+        search_result: SearchResults = SearchResults.create(
+            "dummy_user_id", "search term", "dummy result"
+        )
+        with patch.object(
+            dao, "insert_searches", new=AsyncMock(side_effect=ValueError("db down"))
+        ):
+            with pytest.raises(ValueError, match="db down"):
+                await dao.insert_search(search_result)
+        await dao.aclose()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_aclose_flushes_pending_inserts(self) -> None:
+        dao: YahooSearchDAO = YahooSearchDAO()
+        search_result: SearchResults = SearchResults.create(
+            "dummy_user_id", "search term", "dummy result"
+        )
+        with patch.object(dao, "insert_searches", new=AsyncMock()) as insert_searches:
+            insert_task: asyncio.Task[None] = asyncio.create_task(
+                dao.insert_search(search_result)
+            )
+            # let the submission reach the queue, then close before it is flushed
+            await asyncio.sleep(0)
+            await dao.aclose()
+            await insert_task
+        insert_searches.assert_awaited_once_with([search_result])
+
+    @pytest.mark.asyncio_cooperative
+    async def test_insert_search_only_fails_rejected_row(self) -> None:
+        dao: YahooSearchDAO = YahooSearchDAO()
+        good_results: list[SearchResults] = [
+            SearchResults.create("dummy_user_id", f"search term {i}", "dummy result")
+            for i in range(3)
+        ]
+        bad_result: SearchResults = SearchResults.create(
+            "unknown_user_id", "search term", "dummy result"
+        )
+
+        async def insert_searches(results: list[SearchResults]) -> None:
+            # like the users foreign key, rejecting the whole batch
+            if any(result.user_id == "unknown_user_id" for result in results):
+                raise IntegrityError("INSERT", {}, Exception("fk violation"))
+
+        with patch.object(
+            dao, "insert_searches", new=AsyncMock(side_effect=insert_searches)
+        ):
+            outcomes: list[None | BaseException] = await asyncio.gather(
+                *[dao.insert_search(r) for r in [*good_results, bad_result]],
+                return_exceptions=True,
+            )
+        await dao.aclose()
+        assert outcomes[:3] == [None, None, None]
+        assert isinstance(outcomes[3], IntegrityError)
+
+    @pytest.mark.asyncio_cooperative
+    async def test_fetch_by_term_skips_cache_after_listener_terminates(self) -> None:
+        dao: YahooSearchDAO = YahooSearchDAO()
+        search_result: SearchResults = SearchResults.create(
+            "dummy_user_id", "search term", "dummy result"
+        )
+        # the listener's asyncpg connection, capturing its termination listener
+        termination_listeners: list[Callable[[Any], None]] = []
+        asyncpg_connection: MagicMock = MagicMock()
+        asyncpg_connection.add_termination_listener.side_effect = (
+            termination_listeners.append
+        )
+        asyncpg_connection.add_listener = AsyncMock()
+        asyncpg_connection.is_closed.return_value = True
+        listener_connection: AsyncMock = AsyncMock()
+        listener_connection.get_raw_connection.return_value = MagicMock(
+            driver_connection=asyncpg_connection
+        )
+        engine: MagicMock = MagicMock()
+        engine.connect.return_value.__aenter__.return_value = listener_connection
+        # the connection fetch_by_term's SELECT runs on
+        cursor: MagicMock = MagicMock()
+        cursor.fetchall.return_value = [MagicMock(_mapping=search_result.model_dump())]
+        select_connection: AsyncMock = AsyncMock()
+        select_connection.execute.return_value = cursor
+        autocommit_connection: MagicMock = MagicMock()
+        autocommit_connection.return_value.__aenter__.return_value = select_connection
+
+        with patch.object(dao, "_engine", new=engine), patch.object(
+            dao, "_autocommit_connection", new=autocommit_connection
+        ):
+            await dao.fetch_by_term("search term")
+            await asyncio.wait_for(dao._listening.wait(), timeout=1)
+            # subscribed, so the second lookup is cached and the third is a hit
+            await dao.fetch_by_term("search term")
+            await dao.fetch_by_term("search term")
+            assert select_connection.execute.await_count == 2
+
+            termination_listeners[0](asyncpg_connection)
+            while dao._listening.is_set():
+                await asyncio.sleep(0)
+            assert await dao.fetch_by_term("search term") == [search_result]
+            assert select_connection.execute.await_count == 3
+        await dao.aclose()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_aclose_keeps_pool_shared_until_last_dao(self) -> None:
+        # a database no other test uses, so their DAOs don't share this pool
+        db_config: dict[str, Any] = {
+            "host": "localhost",
+            "port": 5432,
+            "database": "test_aclose_keeps_pool_shared_until_last_dao",
+        }
+        first_dao: YahooSearchDAO = YahooSearchDAO(db_config)
+        second_dao: YahooSearchDAO = YahooSearchDAO(db_config)
+        await first_dao.aclose()
+        await first_dao.aclose()
+
+        # second_dao is still open, so new DAOs keep sharing its pool
+        third_dao: YahooSearchDAO = YahooSearchDAO(db_config)
+        assert third_dao._engine is second_dao._engine
+
+        await second_dao.aclose()
+        await third_dao.aclose()
+        fourth_dao: YahooSearchDAO = YahooSearchDAO(db_config)
+        assert fourth_dao._engine is not third_dao._engine
+        await fourth_dao.aclose()
+
+    @pytest.mark.asyncio_cooperative
+    async def test_closed_dao_raises(self) -> None:
+        dao: YahooSearchDAO = YahooSearchDAO()
+        search_result: SearchResults = SearchResults.create(
+            "dummy_user_id", "search term", "dummy result"
+        )
+        await dao.aclose()
+        with pytest.raises(RuntimeError, match="YahooSearchDAO is closed"):
+            await dao.insert_search(search_result)
+        # no new worker was started, that no later aclose would stop
+        assert dao._insert_worker_task is None
+        with pytest.raises(RuntimeError, match="YahooSearchDAO is closed"):
+            await dao.insert_searches([search_result])
+        with pytest.raises(RuntimeError, match="YahooSearchDAO is closed"):
+            await dao.fetch_by_term("search term")
+        with pytest.raises(RuntimeError, match="YahooSearchDAO is closed"):
+            await dao.fetch_all_searches()
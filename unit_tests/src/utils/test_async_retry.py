@@ -0,0 +1,34 @@
+from unittest.mock import AsyncMock, call, patch
+
+import pytest
+
+from src.utils.async_retry import async_retry
+
+
+class TestAsyncRetry:
+    @pytest.mark.asyncio_cooperative
+    async def test_retries_until_success(self) -> None:
+        fn: AsyncMock = AsyncMock(side_effect=[ValueError(), ValueError(), "done"])
+        with patch("src.utils.async_retry.asyncio.sleep", new=AsyncMock()) as sleep:
+            result: str = await async_retry(
+                exceptions=ValueError, tries=5, delay=0.01, backoff=2
+            )(fn)()
+        assert result == "done"
+        assert fn.await_count == 3
+        # exponential backoff between tries
+        assert sleep.await_args_list == [call(0.01), call(0.02)]
+
+    @pytest.mark.asyncio_cooperative
+    async def test_raises_after_last_try(self) -> None:
+        fn: AsyncMock = AsyncMock(side_effect=ValueError("still failing"))
+        with patch("src.utils.async_retry.asyncio.sleep", new=AsyncMock()):
+            with pytest.raises(ValueError, match="still failing"):
+                await async_retry(exceptions=ValueError, tries=3)(fn)()
+        assert fn.await_count == 3
+
+    @pytest.mark.asyncio_cooperative
+    async def test_does_not_retry_other_exceptions(self) -> None:
+        fn: AsyncMock = AsyncMock(side_effect=KeyError())
+        with pytest.raises(KeyError):
+            await async_retry(exceptions=ValueError, tries=3)(fn)()
+        assert fn.await_count == 1
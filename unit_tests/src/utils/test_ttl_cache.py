@@ -0,0 +1,31 @@
+from unittest.mock import patch
+
+from src.utils.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    def test_get_before_and_after_expiry(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        with patch("src.utils.ttl_cache.time.monotonic", return_value=100.0):
+            cache["coffee"] = 1
+        with patch("src.utils.ttl_cache.time.monotonic", return_value=159.0):
+            assert cache.get("coffee") == 1
+        with patch("src.utils.ttl_cache.time.monotonic", return_value=160.0):
+            assert cache.get("coffee") is None
+            assert len(cache) == 0
+
+    def test_evicts_oldest_when_full(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+        cache["coffee"] = 1
+        cache["tea"] = 2
+        cache["berry"] = 3
+        assert cache.get("coffee") is None
+        assert cache.get("tea") == 2
+        assert cache.get("berry") == 3
+
+    def test_pop(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        cache["coffee"] = 1
+        assert cache.pop("coffee") == 1
+        assert cache.pop("coffee") is None
+        assert "coffee" not in cache